@@ -1,60 +1,127 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
-import json
+import hashlib
+import orjson
 import requests
 from base64 import b64encode, b64decode
+from collections import defaultdict
+from functools import lru_cache
+
+def _read_fixtures_excel(file_path):
+    """Read the fixtures workbook with openpyxl"""
+    # read_only streams the sheet instead of building the whole workbook in memory
+    df = pd.read_excel(
+        file_path,
+        engine='openpyxl',
+        engine_kwargs={'read_only': True, 'data_only': True, 'keep_links': False},
+        # Match on stripped header names so stray whitespace in the workbook is tolerated
+        usecols=lambda c: str(c).strip() in FIXTURE_COLUMNS
+    )
+    # Clean column names
+    df.columns = df.columns.str.strip()
+    # Skip blank rows (e.g. trailing rows with no round) before narrowing the types
+    df = df.dropna(subset=['Round Number'])
+    df = df.astype({
+        'Round Number': 'int32',
+        'Home Team': 'string',
+        'Away Team': 'string',
+        'Location': 'string',
+        'Home Score': 'Int8',
+        'Away Score': 'Int8'
+    })
+    # Unparseable dates become NaT rather than leaving the whole column as objects
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    return df
+
+def _ensure_parquet(xlsx_path):
+    """Convert the fixtures workbook to Parquet when the Parquet copy is missing or stale"""
+    parquet_path = os.path.splitext(xlsx_path)[0] + ".parquet"
+    try:
+        if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(xlsx_path):
+            df = _read_fixtures_excel(xlsx_path)
+            # Write to a temp file first so an interrupted write can't leave a truncated Parquet file
+            tmp_path = parquet_path + ".tmp"
+            df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+            os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        st.warning(f"⚠️ Could not convert fixtures to Parquet: {e}")
+    return parquet_path
 
 @st.cache_data(ttl=300)
-def load_fixtures(file_path):
-    """Load fixtures from Excel file"""
+def load_fixtures(file_path, file_mtime):
+    """Load fixtures from the Parquet copy of the Excel file (file_mtime is only used as part of the cache key)"""
     try:
-        df = pd.read_excel(file_path)
-        # Clean column names
-        df.columns = df.columns.str.strip()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        parquet_path = _ensure_parquet(file_path)
+        df = None
+        if os.path.exists(parquet_path):
+            try:
+                df = pd.read_parquet(parquet_path, columns=FIXTURE_COLUMNS)
+            except Exception as e:
+                st.warning(f"⚠️ Could not read Parquet fixtures, using the Excel file instead: {e}")
+        if df is None:
+            # Fall back to the workbook if the Parquet copy couldn't be written or read
+            df = _read_fixtures_excel(file_path)
+        # Scores are 0-10, so store them as nullable int8
+        df[['Home Score', 'Away Score']] = df[['Home Score', 'Away Score']].astype('Int8')
         return df
     except Exception as e:
         st.error(f"Error loading file: {e}")
         return None
 
 def get_round_fixtures(df, round_num):
-    """Get fixtures for a specific round"""
-    round_df = df[df['Round Number'] == round_num].copy()
-    return round_df
+    """Get fixtures for a specific round (read-only; callers that need to modify it should copy)"""
+    # Rounds are grouped once per session; fall back to filtering if that hasn't happened
+    fixtures_by_round = st.session_state.get('fixtures_by_round')
+    if fixtures_by_round is not None and round_num in fixtures_by_round:
+        return fixtures_by_round[round_num]
+
+    return df.loc[df['Round Number'] == round_num]
+
+def get_scored_fixtures(fixtures_df):
+    """Map (round, fixture index) to (home score, away score) for every fixture with a result"""
+    return {
+        (int(round_num), idx): (int(home), int(away))
+        for idx, round_num, home, away in fixtures_df[['Round Number', 'Home Score', 'Away Score']]
+        .dropna(subset=['Home Score', 'Away Score'])
+        .itertuples(index=True, name=None)
+    }
+
+@lru_cache(maxsize=None)
+def _score_prediction(pred_home, pred_away, actual_home, actual_away):
+    """Score a prediction against a played match (memoised; scores are small ints)"""
+    # Exact score: 5 points (and automatically correct result)
+    if pred_home == actual_home and pred_away == actual_away:
+        return 5, True, True
+
+    # Correct result (win/draw/loss): 2 points
+    pred_diff = pred_home - pred_away
+    actual_diff = actual_home - actual_away
+    if (pred_diff > 0) == (actual_diff > 0) and (pred_diff < 0) == (actual_diff < 0):
+        return 2, False, True
+
+    return 0, False, False
 
 def calculate_points(pred_home, pred_away, actual_home, actual_away):
-    """Calculate points and return detailed result counts"""
-    points = 0
-    exact = False
-    correct_res = False
-    try:
-        pred_home = int(pred_home)
-        pred_away = int(pred_away)
-        actual_home = int(actual_home)
-        actual_away = int(actual_away)
-    except (ValueError, TypeError):
+    """Calculate points and return detailed result counts (scores must already be ints)"""
+    # No result yet (None/NaN/NA) - checked here so it never reaches the cache
+    if actual_home is None or pd.isna(actual_home):
         return 0, False, False
 
-    # Exact score: 5 points (and automatically correct result)
-    if pred_home == actual_home and pred_away == actual_away:
-        points = 5
-        exact = True
-        correct_res = True
-    else:
-        # Correct result (win/draw/loss): 2 points
-        pred_result = "draw" if pred_home == pred_away else ("home" if pred_home > pred_away else "away")
-        actual_result = "draw" if actual_home == actual_away else ("home" if actual_home > actual_away else "away")
+    return _score_prediction(pred_home, pred_away, actual_home, actual_away)
 
-        if pred_result == actual_result:
-            points = 2
-            correct_res = True
-
-    return points, exact, correct_res
+def _predictions_key(all_predictions):
+    """Hash the loaded predictions so caches follow the data wherever it was loaded from"""
+    blob = orjson.dumps(all_predictions, option=orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
 
 #Update calculate_player_points
-def calculate_player_points(player_name, fixtures_df, all_predictions):
-    """Calculate total points for a player across all rounds"""
+@st.cache_data(ttl=300)
+def _compute_player_points(player_name, _fixtures_df, _all_predictions, fixtures_mtime, predictions_key):
+    """Calculate total points for a player across all rounds (cached on the loaded fixtures' mtime and predictions hash)"""
+    fixtures_df = _fixtures_df
+    all_predictions = _all_predictions
     if player_name not in all_predictions:
         return 0, {}
 
@@ -63,18 +130,20 @@ def calculate_player_points(player_name, fixtures_df, all_predictions):
 
     # Use the passed-in all_predictions data
     player_predictions = all_predictions[player_name]
+    scored = get_scored_fixtures(fixtures_df)
+    rounds_with_results = set(
+        fixtures_df.loc[fixtures_df['Home Score'].notna(), 'Round Number'].unique().tolist()
+    )
 
     for round_num, predictions in player_predictions.items():
-        round_fixtures = get_round_fixtures(fixtures_df, round_num)
-        round_points = 0
-
         # Check if results are available for this round
-        if round_fixtures['Home Score'].notna().any():
-            for idx, (fixture_idx, pred) in enumerate(predictions.items()):
-                fixture = round_fixtures[round_fixtures.index == fixture_idx]
-                if not fixture.empty and pd.notna(fixture.iloc[0]['Home Score']):
-                    actual_home = int(fixture.iloc[0]['Home Score'])
-                    actual_away = int(fixture.iloc[0]['Away Score'])
+        if round_num in rounds_with_results:
+            round_points = 0
+
+            for fixture_idx, pred in predictions.items():
+                # Keyed on the round too, so predictions filed under the wrong round don't score
+                if (round_num, fixture_idx) in scored:
+                    actual_home, actual_away = scored[(round_num, fixture_idx)]
                     points, _, _ = calculate_points(
                         pred['home'], pred['away'], actual_home, actual_away
                     )
@@ -86,59 +155,96 @@ def calculate_player_points(player_name, fixtures_df, all_predictions):
 
     return total_points, round_breakdown
 
+def calculate_player_points(player_name, fixtures_df, all_predictions):
+    """Calculate total points for a player across all rounds"""
+    return _compute_player_points(
+        player_name,
+        fixtures_df,
+        all_predictions,
+        # mtime the session's fixtures_df was loaded with, not the file's current one
+        st.session_state.fixtures_mtime,
+        _predictions_key(all_predictions)
+    )
+
 #Update update_leaderboard
-def update_leaderboard(fixtures_df):
+@st.cache_data(ttl=300)
+def _compute_leaderboard(_fixtures_df, _all_predictions, fixtures_mtime, predictions_key):
     """
-    Update leaderboard with all predictions by pulling data directly from the JSON file.
+    Compute the leaderboard from the loaded predictions.
+
+    Cached on the mtime the fixtures were loaded with and a hash of the predictions,
+    so reruns that don't change either skip the recomputation.
+    """
+    fixtures_df = _fixtures_df
+    all_predictions = _all_predictions
+
+    # One row per prediction, joined against the fixture results
+    preds_records = [
+        (player, round_num, fixture_idx, pred['home'], pred['away'])
+        for player, rounds in all_predictions.items()
+        for round_num, predictions in rounds.items()
+        for fixture_idx, pred in predictions.items()
+    ]
+    preds_df = pd.DataFrame.from_records(
+        preds_records, columns=['Player', 'Round', 'Fixture', 'PH', 'PA']
+    ).astype({'Round': 'int32', 'Fixture': 'int64', 'PH': 'int8', 'PA': 'int8'})
+
+    # Join on round as well as fixture so predictions filed under the wrong round are skipped
+    results = (
+        fixtures_df[['Round Number', 'Home Score', 'Away Score']]
+        .rename(columns={'Round Number': 'Round', 'Home Score': 'AH', 'Away Score': 'AA'})
+        .rename_axis('Fixture')
+        .reset_index()
+    )
+    preds_df = preds_df.merge(results, on=['Fixture', 'Round'])
+
+    # Only fixtures that have been played score anything
+    preds_df = preds_df.dropna(subset=['AH', 'AA']).astype({'AH': 'int8', 'AA': 'int8'})
+
+    # Same scoring as calculate_points: 5 for an exact score, 2 for the correct result
+    exact = (preds_df['PH'] == preds_df['AH']) & (preds_df['PA'] == preds_df['AA'])
+    corr = np.sign(preds_df['PH'] - preds_df['PA']) == np.sign(preds_df['AH'] - preds_df['AA'])
+    preds_df = preds_df.assign(exact=exact, corr=corr, pts=np.where(exact, 5, np.where(corr, 2, 0)))
+
+    leaderboard = preds_df.groupby('Player').agg(**{
+        'Exact Scores': ('exact', 'sum'),
+        'Correct Results': ('corr', 'sum'),
+        'Total Points': ('pts', 'sum')
+    })
+
+    # Players without any scored predictions still appear with zeros
+    return leaderboard.reindex(list(all_predictions), fill_value=0).to_dict('index')
+
+def update_leaderboard(fixtures_df, all_predictions):
+    """
+    Update leaderboard with all predictions loaded by load_predictions_data.
 
     The returned dictionary contains 'Exact Scores', 'Correct Results', and 'Total Points'
     for each player.
     """
-    all_predictions = load_predictions_data()
-
-    leaderboard = {}
-
-    for player in all_predictions.keys():
-        total_points = 0
-        exact_scores = 0
-        correct_results = 0
-
-        # Use the loaded predictions
-        player_rounds_predictions = all_predictions[player]
-
-        for round_num, predictions in player_rounds_predictions.items():
-            # Ensure round_num is handled as an integer here if it was string in JSON keys
-            round_fixtures = get_round_fixtures(fixtures_df, round_num)
-
-            # Check if results are available for this round
-            if round_fixtures['Home Score'].notna().any():
-                for fixture_idx, pred in predictions.items():
-                    fixture = round_fixtures[round_fixtures.index == fixture_idx]
-
-                    if not fixture.empty and pd.notna(fixture.iloc[0]['Home Score']):
-                        actual_home = int(fixture.iloc[0]['Home Score'])
-                        actual_away = int(fixture.iloc[0]['Away Score'])
-                        pred_home = pred['home']
-                        pred_away = pred['away']
-
-                        # 🎯 Use the DRY detailed calculation function
-                        points, exact, correct_res = calculate_points(
-                            pred_home, pred_away, actual_home, actual_away
-                        )
-
-                        total_points += points
-                        if exact:
-                            exact_scores += 1
-                        if correct_res:
-                            correct_results += 1
-
-        leaderboard[player] = {
-            'Exact Scores': exact_scores,
-            'Correct Results': correct_results,
-            'Total Points': total_points
-        }
+    return _compute_leaderboard(
+        fixtures_df,
+        all_predictions,
+        # mtime the session's fixtures_df was loaded with, not the file's current one
+        st.session_state.fixtures_mtime,
+        _predictions_key(all_predictions)
+    )
+
+def _group_predictions(raw):
+    """Group prediction records into {player: {round: {fixture: {'home', 'away'}}}}"""
+    grouped = defaultdict(lambda: defaultdict(dict))
+
+    if isinstance(raw, dict):
+        # Older nested format keyed by player -> round -> fixture (string keys)
+        for player, rounds in raw.items():
+            for round_num, preds in rounds.items():
+                for k, v in preds.items():
+                    grouped[player][int(round_num)][int(k)] = v
+    else:
+        for rec in raw:
+            grouped[rec['player']][rec['round']][rec['fixture']] = {'home': rec['home'], 'away': rec['away']}
 
-    return leaderboard
+    return {player: dict(rounds) for player, rounds in grouped.items()}
 
 # Function to load predictions outside of Streamlit's state management
 def load_predictions_data():
@@ -156,16 +262,7 @@ def load_predictions_data():
             r = requests.get(github_url, headers=headers)
             if r.status_code == 200:
                 content = r.json()["content"]
-                decoded = json.loads(b64decode(content).decode("utf-8"))
-                # Convert string keys back to integers where needed
-                predictions = {}
-                for player, rounds in decoded.items():
-                    predictions[player] = {}
-                    for round_num, preds in rounds.items():
-                        predictions[player][int(round_num)] = {
-                            int(k): v for k, v in preds.items()
-                        }
-                return predictions
+                return _group_predictions(orjson.loads(b64decode(content)))
             else:
                 st.warning(f"⚠️ Could not fetch predictions from GitHub: {r.status_code}")
         except Exception as e:
@@ -173,15 +270,8 @@ def load_predictions_data():
 
     # --- Fallback to local file ---
     if os.path.exists(PREDICTIONS_FILE):
-        with open(PREDICTIONS_FILE, 'r') as f:
-            json_predictions = json.load(f)
-            predictions = {}
-            for player, rounds in json_predictions.items():
-                predictions[player] = {}
-                for round_num, preds in rounds.items():
-                    predictions[player][int(round_num)] = {
-                        int(k): v for k, v in preds.items()
-                    }
+        with open(PREDICTIONS_FILE, 'rb') as f:
+            predictions = _group_predictions(orjson.loads(f.read()))
             st.info("📂 Loaded predictions from local file")
             return predictions
 
@@ -191,18 +281,33 @@ def load_predictions_data():
 def save_predictions():
     """Save predictions to file and push to GitHub"""
 
-    # Convert predictions for JSON compatibility
-    json_predictions = {}
-    for player, rounds in st.session_state.predictions.items():
-        json_predictions[player] = {}
-        for round_num, preds in rounds.items():
-            json_predictions[player][str(round_num)] = {
-                str(k): v for k, v in preds.items()
-            }
-
-    # Save locally
-    with open(PREDICTIONS_FILE, 'w') as f:
-        json.dump(json_predictions, f, indent=2)
+    # Store a flat list of records so round/fixture numbers stay integers on disk
+    records = [
+        {'player': player, 'round': round_num, 'fixture': fixture_idx, 'home': pred['home'], 'away': pred['away']}
+        for player, rounds in st.session_state.predictions.items()
+        for round_num, preds in rounds.items()
+        for fixture_idx, pred in preds.items()
+    ]
+    json_predictions = orjson.dumps(records, option=orjson.OPT_INDENT_2)
+
+    # Local writes and GitHub pushes are tracked separately so a failed push can be retried
+    preds_hash = hashlib.blake2b(json_predictions, digest_size=8).digest()
+
+    if preds_hash != st.session_state.get('_preds_hash'):
+        # Save locally, writing to a temp file first so a crash can't leave a truncated file
+        tmp_file = PREDICTIONS_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(json_predictions)
+        os.replace(tmp_file, PREDICTIONS_FILE)
+        st.session_state['_preds_hash'] = preds_hash
+
+        # Scores depend on predictions.json, so drop the cached results
+        _compute_leaderboard.clear()
+        _compute_player_points.clear()
+
+    # Nothing to push if GitHub already has these predictions
+    if preds_hash == st.session_state.get('_pushed_preds_hash'):
+        return
 
     # --- Upload to GitHub ---
     try:
@@ -236,6 +341,8 @@ def save_predictions():
         r = requests.put(api_url, headers=headers, json=payload)
 
         if r.status_code in [200, 201]:
+            # Only remember the save once GitHub has it, so a failed push is retried on resubmit
+            st.session_state['_pushed_preds_hash'] = preds_hash
             st.success("✅ predictions.json updated on GitHub successfully!")
         else:
             st.warning(f"⚠️ GitHub update failed: {r.status_code} - {r.text}")
@@ -244,24 +351,29 @@ def save_predictions():
         st.error(f"❌ Error pushing to GitHub: {e}")
 
 
-def is_round_locked(fixtures_df, round_num):
-    round_fixtures = get_round_fixtures(fixtures_df, round_num)
-
-    # Ensure 'Date' is datetime and find the earliest match time
-    # (Assuming you applied the improvement to convert 'Date' column once in load_fixtures)
+def is_round_locked(fixtures_df, round_num, now):
+    # Earliest kick-off per round is precomputed once per session; fall back to filtering if that hasn't happened
+    round_first_match = st.session_state.get('round_first_match')
+    if round_first_match is not None and round_num in round_first_match:
+        first_match_time = round_first_match[round_num]
+    else:
+        first_match_time = fixtures_df.loc[fixtures_df['Round Number'] == round_num, 'Date'].min()
 
-    if round_fixtures.empty or round_fixtures['Date'].isna().all():
+    if first_match_time is None or pd.isna(first_match_time):
         return False  # No dates available, so don't lock it
 
-    # Find the earliest date/time for the fixtures in this round
-    first_match_time = round_fixtures['Date'].min()
-
     # Compare the earliest match time to the current time
-    return pd.Timestamp.now() >= first_match_time
+    return now >= first_match_time
+
+def get_default_round(round_min, now):
+    """Return the first round that hasn't kicked off yet, otherwise the last round"""
+    upcoming = round_min > now
+    return round_min[upcoming].index.min() if upcoming.any() else round_min.index.max()
 
 # Configuration - Update this path to your Excel file
 PREDICTIONS_FILE = "predictions.json"
 FIXTURES_FILE = "premier_league_fixtures.xlsx"  # Change this to your file name/path
+FIXTURE_COLUMNS = ['Round Number', 'Home Team', 'Away Team', 'Date', 'Location', 'Home Score', 'Away Score']
 
 # Initialize session state
 if 'predictions' not in st.session_state:
@@ -278,7 +390,8 @@ st.markdown("---")
 # Load fixtures from file
 if st.session_state.fixtures_df is None:
     if os.path.exists(FIXTURES_FILE):
-        st.session_state.fixtures_df = load_fixtures(FIXTURES_FILE)
+        st.session_state.fixtures_mtime = os.path.getmtime(FIXTURES_FILE)
+        st.session_state.fixtures_df = load_fixtures(FIXTURES_FILE, st.session_state.fixtures_mtime)
     else:
         st.error(f"❌ Fixtures file not found: {FIXTURES_FILE}")
         st.info("Please ensure your Excel file is in the same directory as this script.")
@@ -286,7 +399,17 @@ if st.session_state.fixtures_df is None:
 
 if st.session_state.fixtures_df is not None:
     fixtures_df = st.session_state.fixtures_df
+
+    # Group fixtures by round once per session so per-round lookups don't rescan the frame
+    if 'fixtures_by_round' not in st.session_state:
+        st.session_state.fixtures_by_round = {
+            int(r): g for r, g in fixtures_df.groupby('Round Number', sort=False)
+        }
+        st.session_state.round_min = fixtures_df.groupby('Round Number')['Date'].min()
+        st.session_state.round_first_match = st.session_state.round_min.to_dict()
+
     available_rounds = sorted(fixtures_df['Round Number'].unique())
+    now = pd.Timestamp.now()  # current date & time, shared by everything on this rerun
 
     # Tabs
     tab1, tab2 = st.tabs(["Make Predictions", "Leaderboard"])
@@ -298,22 +421,7 @@ if st.session_state.fixtures_df is not None:
 
         if player_name:
             # Auto-select next round based on today's date
-            now = pd.Timestamp.now()  # current date & time
-            default_round = available_rounds[0]  # fallback
-
-            for i, round_num in enumerate(available_rounds):
-                round_fixtures = get_round_fixtures(fixtures_df, round_num)
-
-                if (round_fixtures['Date'] <= now).any():
-                    # At least one fixture has started → show NEXT round if it exists
-                    if i + 1 < len(available_rounds):
-                        default_round = available_rounds[i + 1]
-                    else:
-                        default_round = round_num  # last round, stay on it
-                elif (round_fixtures['Date'] > now).any():
-                    # No fixtures started yet → show this round
-                    default_round = round_num
-                    break  # stop at the first upcoming round
+            default_round = get_default_round(st.session_state.round_min, now)
 
             default_index = available_rounds.index(default_round)
 
@@ -325,7 +433,7 @@ if st.session_state.fixtures_df is not None:
             )
 
             round_fixtures = get_round_fixtures(fixtures_df, round_number)
-            locked = is_round_locked(fixtures_df, round_number)
+            locked = is_round_locked(fixtures_df, round_number, now)
 
             # Check if predictions already exist for this player and round
             existing_predictions = None
@@ -336,74 +444,77 @@ if st.session_state.fixtures_df is not None:
 
             st.subheader(f"Round {round_number} Fixtures")
 
-            predictions = {}
             if locked:
                 st.warning(
                     f"🔒 **Round {round_number} is locked.** The first match has started. Predictions can no longer be updated.")
 
-            for idx, row in round_fixtures.iterrows():
-                home_team = row['Home Team']
-                away_team = row['Away Team']
-                date = row['Date']
-                location = row['Location']
-
+            # Build one editor row per fixture
+            default_homes = []
+            default_aways = []
+            actual_results = []
+            your_points = []
+            for idx, home_result, away_result in round_fixtures[['Home Score', 'Away Score']].itertuples(name=None):
                 # Get existing prediction if available
-                default_home = existing_predictions[idx][
-                    'home'] if existing_predictions and idx in existing_predictions else 0
-                default_away = existing_predictions[idx][
-                    'away'] if existing_predictions and idx in existing_predictions else 0
-
-                # Create a card using container with border
-                with st.container(border=True):
-                    st.caption(f"📍 {location} | 📅 {date}")
-
-                    col1, col2, col3, col4 = st.columns([0.5, 0.5, 0.5, 3])
-
-                    with col1:
-                        st.write(f"**{home_team}**")
-                    with col2:
-                        home_score = st.number_input(
-                            "Score",
-                            min_value=0,
-                            max_value=10,
-                            value=default_home,
-                            key=f"pred_home_{player_name}_{idx}_{round_number}",
-                            label_visibility="collapsed"
-                        )
-                    with col3:
-                        away_score = st.number_input(
-                            "Score",
-                            min_value=0,
-                            max_value=10,
-                            value=default_away,
-                            key=f"pred_away_{player_name}_{idx}_{round_number}",
-                            label_visibility="collapsed"
+                existing = existing_predictions.get(idx) if existing_predictions else None
+                default_homes.append(existing['home'] if existing else 0)
+                default_aways.append(existing['away'] if existing else 0)
+
+                # Show actual result if available
+                points = None
+                if pd.notna(home_result):
+                    actual_home = int(home_result)
+                    actual_away = int(away_result)
+                    actual_results.append(f"{actual_home} - {actual_away}")
+
+                    if existing:
+                        points, _, _ = calculate_points(
+                            existing['home'],
+                            existing['away'],
+                            actual_home,
+                            actual_away
                         )
-                    with col4:
-                        st.write(f"**{away_team}**")
-
-                    predictions[idx] = {'home': home_score, 'away': away_score}
-
-                    # Show actual result if available
-                    if pd.notna(row['Home Score']):
-                        actual_home = int(row['Home Score'])
-                        actual_away = int(row['Away Score'])
-                        st.success(f"✅ Actual Result: {actual_home} - {actual_away}")
-
-                        if existing_predictions and idx in existing_predictions:
-                            points, _, _ = calculate_points(
-                                existing_predictions[idx]['home'],
-                                existing_predictions[idx]['away'],
-                                actual_home,
-                                actual_away
-                            )
-                            st.info(f"🎯 Your Points: {points}")
+                else:
+                    actual_results.append(None)
+                your_points.append(points)
+
+            pred_df = pd.DataFrame({
+                'Date': round_fixtures['Date'],
+                'Location': round_fixtures['Location'],
+                'Home': round_fixtures['Home Team'],
+                'home_score': default_homes,
+                'away_score': default_aways,
+                'Away': round_fixtures['Away Team'],
+                'Result': actual_results,
+                'Points': pd.array(your_points, dtype='Int8')
+            }, index=round_fixtures.index)
+
+            score_columns = ['home_score', 'away_score']
+            edited = st.data_editor(
+                pred_df,
+                key=f"pred_editor_{player_name}_{round_number}",
+                width='stretch',
+                hide_index=True,
+                disabled=['Date', 'Location', 'Home', 'Away', 'Result', 'Points'] + (score_columns if locked else []),
+                column_config={
+                    'Date': st.column_config.DatetimeColumn("📅 Date", format="ddd D MMM, HH:mm"),
+                    'Location': "📍 Location",
+                    'home_score': st.column_config.NumberColumn("Score", min_value=0, max_value=10, step=1, required=True),
+                    'away_score': st.column_config.NumberColumn("Score", min_value=0, max_value=10, step=1, required=True),
+                    'Result': "✅ Actual Result",
+                    'Points': "🎯 Your Points"
+                }
+            )
+
+            predictions = {
+                idx: {'home': int(home_score), 'away': int(away_score)}
+                for idx, home_score, away_score in edited[score_columns].itertuples(name=None)
+            }
 
             if st.button("Submit Predictions", type="primary", disabled=locked):
                 if player_name not in st.session_state.predictions:
                     st.session_state.predictions[player_name] = {}
 
-                st.session_state.predictions[player_name][round_number] = predictions
+                st.session_state.predictions[player_name][int(round_number)] = predictions
                 save_predictions()
                 st.success(f"✅ Predictions submitted for {player_name} - Round {round_number}!")
 
@@ -414,8 +525,9 @@ if st.session_state.fixtures_df is not None:
         # Check if the predictions file has any data
         if os.path.exists(PREDICTIONS_FILE) and os.path.getsize(PREDICTIONS_FILE) > 2:
 
-            # Use the updated function which pulls data directly from JSON
-            leaderboard = update_leaderboard(fixtures_df)
+            # Load predictions once (GitHub first, then the local file) for the leaderboard and breakdown
+            all_predictions_data = load_predictions_data()
+            leaderboard = update_leaderboard(fixtures_df, all_predictions_data)
 
             # Convert dictionary to DataFrame
             leaderboard_df = pd.DataFrame.from_dict(leaderboard, orient='index')
@@ -447,9 +559,6 @@ if st.session_state.fixtures_df is not None:
             if st.checkbox("Show detailed breakdown by round"):
                 st.subheader("Detailed Player Scores")
 
-                # Reload predictions here to use in the breakdown (could also pass from update_leaderboard)
-                all_predictions_data = load_predictions_data()
-
                 selected_player = st.selectbox(
                     "Select Player:",
                     sorted(all_predictions_data.keys())
@@ -467,6 +576,7 @@ if st.session_state.fixtures_df is not None:
 
                     # Use the loaded predictions data for the breakdown
                     player_predictions = all_predictions_data.get(selected_player, {})
+                    scored = get_scored_fixtures(fixtures_df)
 
                     for round_num in sorted(player_predictions.keys()):
                         # ... (rest of the detailed breakdown logic remains the same, but using player_predictions)
@@ -474,32 +584,33 @@ if st.session_state.fixtures_df is not None:
                                 f"Round {round_num} - {round_breakdown.get(round_num, 'Results pending')} points"):
                             predictions = player_predictions[round_num]
                             round_fixtures = get_round_fixtures(fixtures_df, round_num)
-                            # ... (rest of the logic using 'predictions' and 'round_fixtures')
+                            # Materialise the round once instead of filtering it per fixture
+                            fx_dict = round_fixtures[['Home Team', 'Away Team']].to_dict('index')
 
                             for fixture_idx, pred in predictions.items():
-                                fixture = round_fixtures[round_fixtures.index == fixture_idx]
-                                if not fixture.empty:
+                                fx = fx_dict.get(fixture_idx)
+                                if fx is not None:
+                                    # Look up the result and score the prediction once per fixture
+                                    result = scored.get((round_num, fixture_idx))
+                                    if result is not None:
+                                        actual_home, actual_away = result
+                                        points, exact, _ = calculate_points(pred['home'], pred['away'],
+                                                                            actual_home, actual_away)
+
                                     with st.container(border=True):
-                                        fixture = fixture.iloc[0]
                                         col1, col2 = st.columns([1, 1])
 
                                         with col1:
-                                            st.write(f"**{fixture['Home Team']} vs {fixture['Away Team']}**")
+                                            st.write(f"**{fx['Home Team']} vs {fx['Away Team']}**")
                                             st.write(f"Your Prediction: {pred['home']} - {pred['away']}")
 
-                                            if pd.notna(fixture['Home Score']):
-                                                actual_home = int(fixture['Home Score'])
-                                                actual_away = int(fixture['Away Score'])
+                                            if result is not None:
                                                 st.write(f"Actual Result: {actual_home} - {actual_away}")
 
                                         with col2:
-                                            # Only calculate points if the match has been played
-                                            if pd.notna(fixture['Home Score']):
-                                                actual_home = int(fixture['Home Score'])
-                                                actual_away = int(fixture['Away Score'])
-                                                points, _, _ = calculate_points(pred['home'], pred['away'],
-                                                                                actual_home, actual_away)
-                                                if points == 4:
+                                            # Only show points if the match has been played
+                                            if result is not None:
+                                                if exact:
                                                     st.success(f"🎯 Perfect! **{points} points**")
                                                 elif points > 0:
                                                     st.info(f"✓ **{points} points**")